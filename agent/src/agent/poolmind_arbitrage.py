@@ -1,6 +1,8 @@
 import re
+from string import Formatter
 from textwrap import dedent
-from typing import Dict, List, Set, Tuple
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Set, Tuple
 from datetime import datetime
 from src.db import DBInterface
 
@@ -13,6 +15,39 @@ from src.sensor.poolmind import PoolMindSensor
 from src.types import ChatHistory, Message
 
 
+def _compile_prompt(template: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Pre-parse a str.format template into a renderer taking a dict of variables.
+    
+    The template is split into literal and field segments once, so rendering
+    only formats the field values and joins. Templates using conversions,
+    attribute/index lookups or nested format specs fall back to str.format.
+    
+    Args:
+        template (str): Prompt template using str.format placeholders
+        
+    Returns:
+        Callable[[Dict[str, Any]], str]: Function rendering the template
+    """
+    segments = list(Formatter().parse(template))
+    
+    for _, field_name, format_spec, conversion in segments:
+        if field_name is not None and (
+            conversion or not field_name.isidentifier() or "{" in format_spec
+        ):
+            return lambda variables: template.format(**variables)
+    
+    def render(variables: Dict[str, Any]) -> str:
+        parts = []
+        for literal, field_name, format_spec, _ in segments:
+            parts.append(literal)
+            if field_name is not None:
+                parts.append(format(variables[field_name], format_spec))
+        return "".join(parts)
+    
+    return render
+
+
 class PoolMindArbitragePromptGenerator:
     """
     Generator for creating prompts used in PoolMind arbitrage agent workflows.
@@ -28,15 +63,25 @@ class PoolMindArbitragePromptGenerator:
         Args:
             prompts (Dict[str, str]): Dictionary containing custom prompts for each function
         """
-        self.prompts = prompts or self.get_default_prompts()
+        if not prompts:
+            # Defaults are validated and compiled once at import and shared read-only
+            self.prompts: Mapping[str, str] = _DEFAULT_PROMPTS
+            self._compiled = _DEFAULT_COMPILED
+            return
+        
+        self.prompts = prompts
         self._validate_prompts(self.prompts)
+        self._compiled = {
+            name: _compile_prompt(prompt) for name, prompt in self.prompts.items()
+        }
     
-    def _validate_prompts(self, prompts: Dict[str, str]):
+    @staticmethod
+    def _validate_prompts(prompts: Mapping[str, str]):
         """
         Validate that all required prompts are present.
         
         Args:
-            prompts (Dict[str, str]): Dictionary of prompts to validate
+            prompts (Mapping[str, str]): Prompts to validate
         
         Raises:
             ValueError: If any required prompt is missing
@@ -54,7 +99,8 @@ class PoolMindArbitragePromptGenerator:
             if prompt_name not in prompts:
                 raise ValueError(f"Required prompt '{prompt_name}' is missing")
     
-    def get_default_prompts(self) -> Dict[str, str]:
+    @staticmethod
+    def get_default_prompts() -> Dict[str, str]:
         """
         Get the default prompts for PoolMind arbitrage agent.
         
@@ -288,7 +334,7 @@ class PoolMindArbitragePromptGenerator:
         Returns:
             str: The formatted system prompt
         """
-        return self.prompts["system_prompt"].format(**kwargs)
+        return self._compiled["system_prompt"](kwargs)
     
     def get_market_analysis_prompt(self, **kwargs) -> str:
         """
@@ -300,7 +346,7 @@ class PoolMindArbitragePromptGenerator:
         Returns:
             str: The formatted market analysis prompt
         """
-        return self.prompts["market_analysis_prompt"].format(**kwargs)
+        return self._compiled["market_analysis_prompt"](kwargs)
     
     def get_arbitrage_strategy_prompt(self, **kwargs) -> str:
         """
@@ -312,7 +358,7 @@ class PoolMindArbitragePromptGenerator:
         Returns:
             str: The formatted arbitrage strategy prompt
         """
-        return self.prompts["arbitrage_strategy_prompt"].format(**kwargs)
+        return self._compiled["arbitrage_strategy_prompt"](kwargs)
     
     def get_fund_request_prompt(self, **kwargs) -> str:
         """
@@ -324,7 +370,7 @@ class PoolMindArbitragePromptGenerator:
         Returns:
             str: The formatted fund request prompt
         """
-        return self.prompts["fund_request_prompt"].format(**kwargs)
+        return self._compiled["fund_request_prompt"](kwargs)
     
     def get_execution_code_prompt(self, **kwargs) -> str:
         """
@@ -336,7 +382,7 @@ class PoolMindArbitragePromptGenerator:
         Returns:
             str: The formatted execution code prompt
         """
-        return self.prompts["execution_code_prompt"].format(**kwargs)
+        return self._compiled["execution_code_prompt"](kwargs)
     
     def get_risk_assessment_prompt(self, **kwargs) -> str:
         """
@@ -348,7 +394,16 @@ class PoolMindArbitragePromptGenerator:
         Returns:
             str: The formatted risk assessment prompt
         """
-        return self.prompts["risk_assessment_prompt"].format(**kwargs)
+        return self._compiled["risk_assessment_prompt"](kwargs)
+
+
+_DEFAULT_PROMPTS: Mapping[str, str] = MappingProxyType(
+    PoolMindArbitragePromptGenerator.get_default_prompts()
+)
+PoolMindArbitragePromptGenerator._validate_prompts(_DEFAULT_PROMPTS)
+_DEFAULT_COMPILED: Mapping[str, Callable[[Dict[str, Any]], str]] = MappingProxyType({
+    name: _compile_prompt(prompt) for name, prompt in _DEFAULT_PROMPTS.items()
+})
 
 
 class PoolMindArbitrageAgent:
@@ -418,17 +473,20 @@ class PoolMindArbitrageAgent:
         """
         self.chat_history = ChatHistory()
     
-    def prepare_system(self, **kwargs) -> ChatHistory:
+    def prepare_system(self, pool_state: Dict[str, Any] | None = None, **kwargs) -> ChatHistory:
         """
         Prepare the system prompt with current pool state and configuration.
         
         Args:
+            pool_state (Dict[str, Any] | None): Pool state already fetched this cycle.
+                Fetched from the sensor if omitted.
             **kwargs: Additional variables for prompt formatting
             
         Returns:
             ChatHistory: Chat history with system prompt
         """
-        pool_state = self.sensor.get_pool_state()
+        if pool_state is None:
+            pool_state = self.sensor.get_pool_state()
         
         system_prompt = self.prompt_generator.get_system_prompt(
             exchanges=", ".join(self.supported_exchanges),
@@ -1,7 +1,7 @@
 import hmac
 import hashlib
-import json
 import time
+import orjson
 from typing import Dict, Any, Optional
 import requests
 from loguru import logger
@@ -23,7 +23,8 @@ class PoolMindClient:
         base_url: str,
         agent_id: str,
         hmac_secret: str,
-        timeout: int = 30
+        timeout: int = 30,
+        session: Optional[requests.Session] = None
     ):
         """
         Initialize the PoolMind client.
@@ -33,12 +34,19 @@ class PoolMindClient:
             agent_id (str): Unique identifier for the agent
             hmac_secret (str): Secret key for HMAC authentication
             timeout (int): Request timeout in seconds
+            session (Optional[requests.Session]): Session to share with other PoolMind
+                components so they reuse the same connection pool. The client creates
+                and owns its own session if omitted.
         """
         self.base_url = base_url.rstrip('/')
         self.agent_id = agent_id
         self.hmac_secret = hmac_secret
         self.timeout = timeout
-        self.session = requests.Session()
+        
+        # Keyed HMAC prototype; copying it skips re-deriving the key pads per request
+        self._hmac_proto = hmac.new(hmac_secret.encode('utf-8'), digestmod=hashlib.sha256)
+        self._owns_session = session is None
+        self.session = session if session is not None else requests.Session()
         
         # Set default headers
         self.session.headers.update({
@@ -46,14 +54,19 @@ class PoolMindClient:
             'User-Agent': f'PoolMind-Agent/{agent_id}'
         })
     
-    def _generate_hmac_signature(self, method: str, path: str, body: str = "", timestamp: str = None) -> str:
+    def close(self) -> None:
+        """Close the pooled HTTP connections held by the client, unless the session is shared."""
+        if self._owns_session:
+            self.session.close()
+    
+    def _generate_hmac_signature(self, method: str, path: str, body: str | bytes = "", timestamp: str = None) -> str:
         """
         Generate HMAC signature for request authentication.
         
         Args:
             method (str): HTTP method (GET, POST, etc.)
             path (str): API endpoint path
-            body (str): Request body (for POST requests)
+            body (str | bytes): Request body (for POST requests), signed as sent
             timestamp (str): Request timestamp (in milliseconds)
             
         Returns:
@@ -62,17 +75,15 @@ class PoolMindClient:
         if timestamp is None:
             timestamp = str(int(time.time() * 1000))  # Use milliseconds
         
-        # Create message to sign: method + path + timestamp + body
-        message = f"{method.upper()}{path}{timestamp}{body}"
+        if isinstance(body, str):
+            body = body.encode('utf-8')
         
-        # Generate HMAC signature
-        signature = hmac.new(
-            self.hmac_secret.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        # Sign message: method + path + timestamp + body
+        mac = self._hmac_proto.copy()
+        mac.update(f"{method.upper()}{path}{timestamp}".encode('utf-8'))
+        mac.update(body)
         
-        return signature
+        return mac.hexdigest()
     
     def _make_authenticated_request(
         self,
@@ -97,8 +108,8 @@ class PoolMindClient:
         url = f"{self.base_url}{endpoint}"
         timestamp = str(int(time.time() * 1000))  # Use milliseconds
         
-        # Prepare request body
-        body = json.dumps(data) if data else ""
+        # Prepare request body; the exact bytes sent are the bytes signed
+        body = orjson.dumps(data) if data else b""
         
         # Generate HMAC signature
         signature = self._generate_hmac_signature(method, endpoint, body, timestamp)
@@ -151,7 +162,7 @@ class PoolMindClient:
                 data=data
             )
             
-            result = response.json()
+            result = orjson.loads(response.content)
             logger.info(f"Fund request submitted: {result}")
             return result
             
@@ -180,7 +191,7 @@ class PoolMindClient:
                 endpoint="/api/v1/fund-request/admin/balance"
             )
             
-            result = response.json()
+            result = orjson.loads(response.content)
             logger.info(f"Admin wallet info: {result}")
             return result
             
@@ -209,8 +220,8 @@ class PoolMindClient:
             )
             
             response.raise_for_status()
-            result = response.json()
-            logger.debug(f"Pool state: {result}")
+            result = orjson.loads(response.content)
+            logger.debug("Pool state: {}", result)
             return result
             
         except requests.HTTPError as e:
@@ -237,8 +248,8 @@ class PoolMindClient:
             )
             
             response.raise_for_status()
-            result = response.json()
-            logger.debug(f"Pool info: {result}")
+            result = orjson.loads(response.content)
+            logger.debug("Pool info: {}", result)
             return result
             
         except requests.HTTPError as e:
@@ -265,8 +276,8 @@ class PoolMindClient:
             )
             
             response.raise_for_status()
-            result = response.json()
-            logger.debug(f"Current NAV: {result}")
+            result = orjson.loads(response.content)
+            logger.debug("Current NAV: {}", result)
             return result
             
         except requests.HTTPError as e:
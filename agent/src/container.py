@@ -45,13 +45,30 @@ class ContainerManager:
 		self.client = client
 		self.host_cache_folder = Path(host_cache_folder)
 
+		self.container_identifier = container_identifier
+		self.container = self._find_or_create_container()
+		self.in_con_env = in_con_env
+		self._closed = False
+
+	def _find_or_create_container(self) -> Container:
+		"""
+		Find the container by name or ID, creating and starting it if it doesn't exist.
+
+		Returns:
+		    Container: The container to execute code in
+
+		Raises:
+		    ValueError: If the container cannot be found or created, or if the retrieved object is not a Container
+		"""
+		container_identifier = self.container_identifier
+
 		try:
-			_container = client.containers.get(container_identifier)
+			_container = self.client.containers.get(container_identifier)
 		except docker.errors.NotFound:
 			# If not found, try listing all containers and searching by name
 			# Generate the sanitized container name for searching
 			container_name = container_identifier.replace("/", "-").replace(":", "-")
-			all_containers = client.containers.list(all=True)
+			all_containers = self.client.containers.list(all=True)
 			matching_containers = [
 				c for c in all_containers if container_name in (c.name, c.id) or container_identifier in (c.name, c.id)
 			]
@@ -64,7 +81,7 @@ class ContainerManager:
 					# Remove invalid characters for container names
 					container_name = container_identifier.replace("/", "-").replace(":", "-")
 					
-					_container = client.containers.create(
+					_container = self.client.containers.create(
 						image=container_identifier,  # Use the full image name:tag
 						name=container_name,  # Use sanitized name for container
 						hostname=container_name,
@@ -88,8 +105,49 @@ class ContainerManager:
 			logger.error(f"Retrieved object is not a Container: {container_identifier}")
 			raise ValueError("Retrieved object is not a Container")
 
-		self.container = _container
-		self.in_con_env = in_con_env
+		return _container
+
+	def get_or_create(self) -> Container:
+		"""
+		Get the execution container, making sure it is running.
+
+		The already-resolved container is reused when it is still running. A
+		stopped container is started again and a removed one is recreated, so
+		long-running agents survive container restarts without rebuilding the
+		manager.
+
+		Returns:
+		    Container: The running container
+		"""
+		try:
+			self.container.reload()
+		except docker.errors.NotFound:
+			logger.info(
+				f"Container {self.container_identifier} no longer exists, recreating it"
+			)
+			self.container = self._find_or_create_container()
+			return self.container
+
+		if self.container.status != "running":
+			logger.info(
+				f"Container {self.container_identifier} is {self.container.status}, starting it"
+			)
+			self.container.start()
+
+		return self.container
+
+	def close(self) -> None:
+		"""
+		Release the Docker client connection held by this manager.
+
+		The container itself is left running so it can be reused. Calling this
+		more than once is a no-op.
+		"""
+		if self._closed:
+			return
+
+		self.client.close()
+		self._closed = True
 
 	def write_code_in_con(
 		self, code: str, postfix: str, in_container_path: str = "/"
@@ -187,6 +245,7 @@ class ContainerManager:
 		    - The execution has a timeout of 150 seconds
 		    - After execution, any remaining Python processes are killed
 		"""
+		self.get_or_create()
 		temp_file_path, reflected_code = self.write_code_in_con(code, postfix)
 
 		# Fix command to use shell redirection properly
@@ -18,7 +18,7 @@ class PoolMindArbitrageState(Enum):
     HIGH_RISK_ABORT = "high_risk_abort"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PoolMetrics:
     """
     Data class representing PoolMind pool metrics.
@@ -67,7 +67,7 @@ class ExchangeData:
     last_updated: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class ArbitrageOpportunityData:
     """
     Data class representing a specific arbitrage opportunity.
@@ -292,3 +292,10 @@ class DBInterface(ABC, Generic[T]):
 			Optional[str]: URL of the profile image if found, None otherwise
 		"""
 		pass
+
+	def flush(self) -> None:
+		"""Write any buffered rows to the database.
+
+		Implementations that write through immediately need not override this.
+		"""
+		pass
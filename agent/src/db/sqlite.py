@@ -1,7 +1,11 @@
+import atexit
 import json
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from dataclasses import dataclass
 from src.datatypes import StrategyData, StrategyInsertData
 from src.db.interface import DBInterface
@@ -9,6 +13,98 @@ from src.types import ChatHistory
 import uuid
 
 
+# WAL lets readers proceed alongside the writer; NORMAL sync is safe under WAL
+# and avoids an fsync on every commit.
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+"""
+
+_INSERT_CHAT_HISTORY = "INSERT INTO sup_chat_history (session_id, message_type, content, timestamp) VALUES (?, ?, ?, ?)"
+
+
+class WriteBuffer:
+	"""Accumulate INSERT statements and write them in a single transaction.
+
+	Pending rows are flushed once ``max_rows`` have been queued or the oldest
+	pending row is ``max_delay`` seconds old. There is no background timer:
+	the age check only runs when a row is added, so callers must call
+	``flush()`` once a batch of writes is complete and before shutdown.
+	"""
+
+	def __init__(
+		self,
+		conn: sqlite3.Connection,
+		max_rows: int = 256,
+		max_delay: float = 1.0,
+		conn_lock: Optional[threading.RLock] = None,
+	):
+		"""Create a write buffer on top of an open SQLite connection.
+
+		Args:
+		    conn (sqlite3.Connection): Connection the buffered rows are written to
+		    max_rows (int, optional): Number of pending rows that triggers a flush. Defaults to 256.
+		    max_delay (float, optional): Age in seconds of the oldest pending row that triggers a flush. Defaults to 1.0.
+		    conn_lock (Optional[threading.RLock], optional): Lock held by every other user of ``conn``. Defaults to a private lock.
+		"""
+		self._conn = conn
+		self._conn_lock = conn_lock or threading.RLock()
+		self.max_rows = max_rows
+		self.max_delay = max_delay
+		self._pending: List[Tuple[str, tuple]] = []
+		self._first_at = 0.0
+		self._lock = threading.Lock()
+
+	def add(self, sql: str, params: tuple) -> None:
+		"""Queue a single statement, flushing if the buffer is full or stale.
+
+		Args:
+		    sql (str): Parameterized INSERT statement
+		    params (tuple): Parameters for the statement
+		"""
+		self.add_many(sql, [params])
+
+	def add_many(self, sql: str, rows: List[tuple]) -> None:
+		"""Queue the same statement for several parameter rows.
+
+		Args:
+		    sql (str): Parameterized INSERT statement
+		    rows (List[tuple]): Parameters for each row
+		"""
+		with self._lock:
+			if not self._pending:
+				self._first_at = time.monotonic()
+			self._pending.extend((sql, params) for params in rows)
+			due = (
+				len(self._pending) >= self.max_rows
+				or time.monotonic() - self._first_at >= self.max_delay
+			)
+		if due:
+			self.flush()
+
+	def flush(self) -> None:
+		"""Write all pending rows in one transaction, grouped by statement.
+
+		Raises:
+		    sqlite3.Error: If the rows cannot be written; they are dropped from the buffer
+		"""
+		with self._lock:
+			if not self._pending:
+				return
+			pending, self._pending = self._pending, []
+
+		grouped: Dict[str, List[tuple]] = {}
+		for sql, params in pending:
+			grouped.setdefault(sql, []).append(params)
+
+		with self._conn_lock, self._conn as conn:
+			for sql, rows in grouped.items():
+				conn.executemany(sql, rows)
+
+
 @dataclass
 class TokenPriceData:
 	token_addr: str
@@ -19,14 +115,59 @@ class TokenPriceData:
 
 
 class SQLiteDB(DBInterface):
-	def __init__(self, db_path: str):
+	def __init__(self, db_path: str, wal: bool = False, buffer_writes: bool = False):
 		"""Initialize SQLite database connection and create tables if they don't exist.
 
 		Args:
 		    db_path (str): Path to the SQLite database file
+		    wal (bool, optional): Switch the file to WAL journaling and apply the
+		        connection tuning pragmas. The journal mode persists in the file,
+		        so only enable this for a database no other agent shares. Defaults to False.
+		    buffer_writes (bool, optional): Batch chat history inserts in a WriteBuffer.
+		        Buffered rows only reach disk on flush() or close(), so the caller
+		        must flush once its writes are done. Defaults to False (write-through).
 		"""
 		self.db_path = db_path
+		# A single long-lived connection keeps sqlite3's prepared statement
+		# cache warm across calls; it may be used from several threads, so
+		# every transaction on it holds _conn_lock
+		self._conn = sqlite3.connect(db_path, check_same_thread=False)
+		self._conn_lock = threading.RLock()
+		if wal:
+			self._conn.executescript(_CONNECTION_PRAGMAS)
 		self._init_db()
+		# Chat history is write-only from the flows, so callers that flush at the
+		# end of each cycle can batch it
+		self._write_buffer: Optional[WriteBuffer] = None
+		if buffer_writes:
+			self._write_buffer = WriteBuffer(self._conn, conn_lock=self._conn_lock)
+			atexit.register(self.flush)
+
+	@contextmanager
+	def _transaction(self) -> Iterator[sqlite3.Connection]:
+		"""Run one transaction on the shared connection while holding its lock."""
+		with self._conn_lock, self._conn as conn:
+			yield conn
+
+	def flush(self) -> None:
+		"""Write any buffered rows to the database."""
+		if self._conn is None or self._write_buffer is None:
+			return
+
+		self._write_buffer.flush()
+
+	def close(self) -> None:
+		"""Close the database connection. Calling this more than once is a no-op."""
+		if self._conn is None:
+			return
+
+		try:
+			self.flush()
+		finally:
+			atexit.unregister(self.flush)
+			with self._conn_lock:
+				self._conn.close()
+				self._conn = None
 
 	def _init_db(self):
 		"""Initialize database tables and seed data from SQL files."""
@@ -37,14 +178,14 @@ class SQLiteDB(DBInterface):
 		with open("src/db/00002_seed.sql", "r") as f:
 			seed_script = f.read()
 
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			cursor.executescript(init_script)
 			cursor.executescript(seed_script)
 			conn.commit()
 
 	def fetch_params_using_agent_id(self, agent_id: str) -> Dict[str, Dict[str, Any]]:
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			cursor.execute(
 				"SELECT strategy_id, parameters, summarized_desc, full_desc FROM sup_strategies WHERE agent_id = ?",
@@ -66,7 +207,7 @@ class SQLiteDB(DBInterface):
 		self, agent_id: str, strategy_result: StrategyInsertData
 	) -> bool:
 		try:
-			with sqlite3.connect(self.db_path) as conn:
+			with self._transaction() as conn:
 				cursor = conn.cursor()
 				cursor.execute(
 					"""INSERT INTO sup_strategies (strategy_id, agent_id, parameters, summarized_desc, full_desc)
@@ -86,7 +227,7 @@ class SQLiteDB(DBInterface):
 			return False
 
 	def fetch_latest_strategy(self, agent_id: str) -> Optional[StrategyData]:
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			cursor.execute(
 				"""SELECT strategy_id, parameters, summarized_desc, full_desc, strategy_result, created_at 
@@ -111,7 +252,7 @@ class SQLiteDB(DBInterface):
 			return None
 
 	def fetch_all_strategies(self, agent_id: str) -> List[StrategyData]:
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			cursor.execute(
 				"""SELECT strategy_id, parameters, summarized_desc, full_desc, strategy_result, created_at 
@@ -142,22 +283,24 @@ class SQLiteDB(DBInterface):
 		base_timestamp: Optional[str] = None,
 	) -> bool:
 		try:
-			with sqlite3.connect(self.db_path) as conn:
-				cursor = conn.cursor()
-				for message in chat_history.messages:
-					timestamp = base_timestamp or datetime.now().strftime(
-						"%Y-%m-%d %H:%M:%S"
-					)
-					cursor.execute(
-						"INSERT INTO sup_chat_history (session_id, message_type, content, timestamp) VALUES (?, ?, ?, ?)",
-						(session_id, "message", message, timestamp),
-					)
-				return True
+			timestamp = base_timestamp or datetime.now().strftime(
+				"%Y-%m-%d %H:%M:%S"
+			)
+			rows = [
+				(session_id, message.role, message.content, timestamp)
+				for message in chat_history.messages
+			]
+			if self._write_buffer is not None:
+				self._write_buffer.add_many(_INSERT_CHAT_HISTORY, rows)
+			else:
+				with self._transaction() as conn:
+					conn.executemany(_INSERT_CHAT_HISTORY, rows)
+			return True
 		except sqlite3.Error:
 			return False
 
 	def fetch_latest_notification_str(self, sources: List[str]) -> str:
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			placeholders = ",".join(["?" for _ in sources])
 			cursor.execute(
@@ -173,7 +316,7 @@ class SQLiteDB(DBInterface):
 	def fetch_latest_notification_str_v2(
 		self, sources: List[str], limit: int = 1
 	) -> str:
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			results = []
 			for source in sources:
@@ -190,7 +333,7 @@ class SQLiteDB(DBInterface):
 			return "\n".join(results)
 
 	def get_agent_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			cursor.execute(
 				"""SELECT agent_id, started_at, status, cycle_count, fe_data, will_end_at 
@@ -213,7 +356,7 @@ class SQLiteDB(DBInterface):
 
 	def update_agent_session(self, session_id: str, agent_id: str, status: str) -> bool:
 		try:
-			with sqlite3.connect(self.db_path) as conn:
+			with self._transaction() as conn:
 				cursor = conn.cursor()
 				cursor.execute(
 					"""UPDATE sup_agent_sessions 
@@ -227,7 +370,7 @@ class SQLiteDB(DBInterface):
 
 	def add_cycle_count(self, session_id: str, agent_id: str) -> bool:
 		try:
-			with sqlite3.connect(self.db_path) as conn:
+			with self._transaction() as conn:
 				cursor = conn.cursor()
 				cursor.execute(
 					"""UPDATE sup_agent_sessions 
@@ -243,7 +386,7 @@ class SQLiteDB(DBInterface):
 		self, session_id: str, agent_id: str, started_at: str, status: str
 	) -> bool:
 		try:
-			with sqlite3.connect(self.db_path) as conn:
+			with self._transaction() as conn:
 				cursor = conn.cursor()
 				cursor.execute(
 					"""INSERT INTO sup_agent_sessions (session_id, agent_id, started_at, status)
@@ -262,7 +405,7 @@ class SQLiteDB(DBInterface):
 		refresh_token: str,
 	) -> bool:
 		try:
-			with sqlite3.connect(self.db_path) as conn:
+			with self._transaction() as conn:
 				cursor = conn.cursor()
 				cursor.execute(
 					"""INSERT OR REPLACE INTO sup_twitter_token 
@@ -282,7 +425,7 @@ class SQLiteDB(DBInterface):
 		refresh_token: str,
 	) -> bool:
 		try:
-			with sqlite3.connect(self.db_path) as conn:
+			with self._transaction() as conn:
 				cursor = conn.cursor()
 				cursor.execute(
 					"""UPDATE sup_twitter_token 
@@ -297,7 +440,7 @@ class SQLiteDB(DBInterface):
 	def get_twitter_token(
 		self, agent_id: str, access_token: str, refresh_token: str
 	) -> Optional[Dict[str, Any]]:
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			cursor.execute(
 				"""SELECT agent_id, last_refreshed_at, access_token, refresh_token 
@@ -320,7 +463,7 @@ class SQLiteDB(DBInterface):
 		self, snapshot_id: str, agent_id: str, total_value_usd: float, assets: str
 	) -> bool:
 		try:
-			with sqlite3.connect(self.db_path) as conn:
+			with self._transaction() as conn:
 				cursor = conn.cursor()
 				cursor.execute(
 					"""INSERT INTO sup_wallet_snapshots (snapshot_id, agent_id, total_value_usd, assets)
@@ -348,7 +491,7 @@ class SQLiteDB(DBInterface):
 		return {}
 
 	def get_agent_profile_image(self, agent_id: str) -> Optional[str]:
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			cursor.execute(
 				"""SELECT profile_image 
@@ -366,7 +509,7 @@ class SQLiteDB(DBInterface):
 		return self.get_token_price("ETH")
 
 	def get_token_price(self, symbol: str) -> Optional[TokenPriceData]:
-		with sqlite3.connect(self.db_path) as conn:
+		with self._transaction() as conn:
 			cursor = conn.cursor()
 			cursor.execute(
 				"""SELECT token_addr, symbol, price, last_updated_at, metadata 
@@ -388,7 +531,7 @@ class SQLiteDB(DBInterface):
 
 	def insert_token_price(self, token_addr, symbol, price, metadata=""):
 		try:
-			with sqlite3.connect(self.db_path) as conn:
+			with self._transaction() as conn:
 				cursor = conn.cursor()
 				cursor.execute(
 					"""INSERT INTO sup_token_price (token_addr, symbol, price, last_updated_at, metadata)
@@ -401,7 +544,7 @@ class SQLiteDB(DBInterface):
 
 	def update_token_price(self, token_addr, symbol, price, metadata) -> bool:
 		try:
-			with sqlite3.connect(self.db_path) as conn:
+			with self._transaction() as conn:
 				cursor = conn.cursor()
 				cursor.execute(
 					"""UPDATE sup_token_price 
@@ -1,7 +1,10 @@
+import concurrent.futures
 import json
+import threading
+import time
 from datetime import timedelta
 from textwrap import dedent
-from typing import Callable, List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
 
 from loguru import logger
 from result import UnwrapError
@@ -27,7 +30,9 @@ def poolmind_arbitrage_flow(
     notif_str: str,
     poolmind_client: PoolMindClient,
     summarizer: Callable[[List[str]], str],
-):
+    executor: Optional[concurrent.futures.Executor] = None,
+    pool_state: Optional[Dict[str, Any]] = None,
+) -> bool:
     """
     Execute a PoolMind arbitrage trading workflow.
     
@@ -46,9 +51,13 @@ def poolmind_arbitrage_flow(
         notif_str (str): Notification string to process
         poolmind_client (PoolMindClient): Client for PoolMind API interactions
         summarizer (Callable[[List[str]], str]): Function to summarize text
+        executor (Optional[concurrent.futures.Executor]): Executor used to run the
+            RAG lookup alongside the pool state fetch. Both run sequentially if omitted.
+        pool_state (Optional[Dict[str, Any]]): Pool state the caller has just fetched.
+            Fetched from the sensor if omitted.
     
     Returns:
-        None: This function doesn't return a value but logs its progress
+        bool: True if the cycle ran to completion, False if it ended early
     """
     agent.reset()
     
@@ -57,8 +66,18 @@ def poolmind_arbitrage_flow(
     logger.info("Reset agent")
     logger.info("Starting PoolMind arbitrage flow")
     
-    # Get initial pool state
-    pool_state = agent.sensor.get_pool_state()
+    # The RAG lookup doesn't depend on the pool state, so overlap the two requests
+    # when the caller provides an executor
+    rag_query = notif_str or "STX arbitrage opportunities"
+    rag_future = (
+        executor.submit(agent.rag.relevant_strategy_raw_v4, rag_query)
+        if executor is not None
+        else None
+    )
+    
+    # Get initial pool state, unless the caller has just fetched it
+    if pool_state is None:
+        pool_state = agent.sensor.get_pool_state()
     logger.info(f"Initial pool state: {pool_state}")
     
     # Initialize system prompt
@@ -74,10 +93,13 @@ def poolmind_arbitrage_flow(
     # Get relevant strategies from RAG
     if notif_str:
         logger.info(f"Getting relevant RAG strategies with query: {notif_str[:100]}...")
-        related_strategies = agent.rag.relevant_strategy_raw_v4(notif_str)
     else:
         logger.info("No notification string provided, getting general strategies")
-        related_strategies = agent.rag.relevant_strategy_raw_v4("STX arbitrage opportunities")
+    related_strategies = (
+        rag_future.result()
+        if rag_future is not None
+        else agent.rag.relevant_strategy_raw_v4(rag_query)
+    )
     
     rag_result = {
         "summary": "No relevant RAG strategies found",
@@ -128,7 +150,7 @@ def poolmind_arbitrage_flow(
     
     if not market_analysis_success:
         logger.error("Market analysis failed after 3 attempts, aborting cycle")
-        return
+        return False
     
     logger.info(f"Market analysis results: {market_analysis_output[:500]}...")
     
@@ -154,7 +176,7 @@ def poolmind_arbitrage_flow(
     
     if not strategy_success:
         logger.error("Strategy generation failed after 3 attempts, aborting cycle")
-        return
+        return False
     
     logger.info(f"Strategy generated: {strategy_output[:500]}...")
     
@@ -164,7 +186,7 @@ def poolmind_arbitrage_flow(
     
     if not opportunities:
         logger.info("No arbitrage opportunities found, ending cycle")
-        return
+        return False
     
     # Select best opportunity
     best_opportunity = opportunities[0]  # Already sorted by profit percentage
@@ -175,7 +197,7 @@ def poolmind_arbitrage_flow(
     if best_opportunity.profit_percentage < min_profit_threshold:
         logger.info(f"Best opportunity ({best_opportunity.profit_percentage:.2f}%) "
                    f"below minimum threshold ({min_profit_threshold}%), skipping")
-        return
+        return False
     
     # Step 4: Risk Assessment
     logger.info("Step 4: Performing risk assessment...")
@@ -216,7 +238,7 @@ def poolmind_arbitrage_flow(
     # Check risk recommendation
     if risk_data.get("recommendation") == "abort":
         logger.info(f"Risk assessment recommends aborting (risk score: {risk_data.get('risk_score')})")
-        return
+        return False
     
     # Step 5: Fund Request
     logger.info("Step 5: Requesting funds from PoolMind...")
@@ -259,7 +281,7 @@ def poolmind_arbitrage_flow(
     
     if not fund_request_success or approved_amount <= 0:
         logger.info("Fund request failed or rejected, ending cycle")
-        return
+        return False
     
     # Step 6: Execute Arbitrage Trade
     logger.info("Step 6: Executing arbitrage trade...")
@@ -294,7 +316,7 @@ def poolmind_arbitrage_flow(
     if not trade_execution_success:
         logger.error("Trade execution failed after 3 attempts")
         # In a real implementation, we would need to return the funds to PoolMind
-        return
+        return False
     
     logger.info(f"Trade execution results: {trade_output[:500]}...")
     
@@ -393,7 +415,14 @@ def poolmind_arbitrage_flow(
     except Exception as e:
         logger.error(f"Failed to save strategy: {e}")
     
+    # Chat history is buffered; write this cycle's rows before the next one starts
+    try:
+        agent.db.flush()
+    except Exception as e:
+        logger.error(f"Failed to flush chat history: {e}")
+    
     logger.info("PoolMind arbitrage cycle completed successfully")
+    return True
 
 
 def poolmind_monitoring_flow(
@@ -401,6 +430,8 @@ def poolmind_monitoring_flow(
     session_id: str,
     poolmind_client: PoolMindClient,
     monitoring_interval: int = 60,
+    stop_event: Optional[threading.Event] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
 ):
     """
     Continuous monitoring flow for PoolMind arbitrage opportunities.
@@ -412,11 +443,28 @@ def poolmind_monitoring_flow(
         agent (PoolMindArbitrageAgent): The arbitrage agent
         session_id (str): Session identifier
         poolmind_client (PoolMindClient): PoolMind API client
-        monitoring_interval (int): Monitoring interval in seconds
+        monitoring_interval (int): Seconds between the starts of consecutive checks
+        stop_event (Optional[threading.Event]): Event that ends the flow as soon as
+            it is set, including while waiting between checks. Runs until
+            interrupted if omitted.
+        executor (Optional[concurrent.futures.Executor]): Executor passed on to
+            each arbitrage cycle for its concurrent lookups
     """
     logger.info("Starting PoolMind continuous monitoring flow")
     
-    while True:
+    if stop_event is None:
+        stop_event = threading.Event()
+    
+    # Quotes and pool state of the last cycle that ran to completion; if neither
+    # the market nor the pool has moved, re-running the LLM pipeline would only
+    # repeat that cycle
+    last_cycle_key = None
+    
+    while not stop_event.is_set():
+        # Checks start every monitoring_interval seconds regardless of how long a
+        # cycle takes; the monotonic clock keeps the cadence immune to clock changes
+        next_check = time.monotonic() + monitoring_interval
+        
         try:
             # Check for arbitrage opportunities
             opportunities = agent.sensor.identify_arbitrage_opportunities()
@@ -424,30 +472,50 @@ def poolmind_monitoring_flow(
             if opportunities:
                 best_opportunity = opportunities[0]
                 
-                if best_opportunity.profit_percentage >= agent.min_profit_threshold:
-                    logger.info(f"Profitable opportunity found: {best_opportunity.profit_percentage:.2f}%")
-                    
-                    # Execute the full arbitrage flow
-                    poolmind_arbitrage_flow(
-                        agent=agent,
-                        session_id=session_id,
-                        role="continuous_arbitrage_trader",
-                        supported_exchanges=agent.supported_exchanges,
-                        min_profit_threshold=agent.min_profit_threshold,
-                        max_trade_size_percent=agent.max_trade_size_percent,
-                        prev_strat=None,
-                        notif_str=f"Arbitrage opportunity: {best_opportunity.profit_percentage:.2f}% profit",
-                        poolmind_client=poolmind_client,
-                        summarizer=lambda x: " ".join(x) if isinstance(x, list) else str(x)
-                    )
+                if best_opportunity.profit_percentage < agent.min_profit_threshold:
+                    logger.debug("Opportunity below threshold: {:.2f}%", best_opportunity.profit_percentage)
                 else:
-                    logger.debug(f"Opportunity below threshold: {best_opportunity.profit_percentage:.2f}%")
+                    pool_state = agent.sensor.get_pool_state()
+                    cycle_key = (
+                        best_opportunity.buy_exchange,
+                        best_opportunity.sell_exchange,
+                        best_opportunity.buy_price,
+                        best_opportunity.sell_price,
+                        best_opportunity.required_amount,
+                        pool_state["current_nav"],
+                        pool_state["available_stx"],
+                        pool_state["total_shares"],
+                        pool_state["pool_size"],
+                    )
+                    
+                    if cycle_key == last_cycle_key:
+                        logger.debug("Best opportunity and pool state unchanged since the last cycle, skipping")
+                    else:
+                        logger.info(f"Profitable opportunity found: {best_opportunity.profit_percentage:.2f}%")
+                        
+                        # Execute the full arbitrage flow; a cycle that ends early is
+                        # retried on the next check even if nothing has changed
+                        completed = poolmind_arbitrage_flow(
+                            agent=agent,
+                            session_id=session_id,
+                            role="continuous_arbitrage_trader",
+                            supported_exchanges=agent.supported_exchanges,
+                            min_profit_threshold=agent.min_profit_threshold,
+                            max_trade_size_percent=agent.max_trade_size_percent,
+                            prev_strat=None,
+                            notif_str=f"Arbitrage opportunity: {best_opportunity.profit_percentage:.2f}% profit",
+                            poolmind_client=poolmind_client,
+                            summarizer=lambda x: " ".join(x) if isinstance(x, list) else str(x),
+                            executor=executor,
+                            pool_state=pool_state,
+                        )
+                        if completed:
+                            last_cycle_key = cycle_key
             else:
                 logger.debug("No arbitrage opportunities found")
             
-            # Wait before next check
-            import time
-            time.sleep(monitoring_interval)
+            # Wait before next check, waking up early on shutdown
+            stop_event.wait(max(0.0, next_check - time.monotonic()))
             
         except KeyboardInterrupt:
             logger.info("Monitoring flow interrupted by user")
@@ -455,5 +523,4 @@ def poolmind_monitoring_flow(
         except Exception as e:
             logger.error(f"Error in monitoring flow: {e}")
             # Continue monitoring despite errors
-            import time
-            time.sleep(monitoring_interval) 
\ No newline at end of file
+            stop_event.wait(max(0.0, next_check - time.monotonic())) 
\ No newline at end of file
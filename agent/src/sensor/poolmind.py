@@ -1,14 +1,61 @@
+import concurrent.futures
 import hashlib
 import hmac
-import json
-from typing import Any, Dict, List, Optional
-from decimal import Decimal
+import orjson
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
 import time
+from time import time_ns
+import numpy as np
 import requests
 from loguru import logger
 from functools import partial
 from dataclasses import dataclass
-from datetime import datetime
+
+
+def _now_epoch() -> int:
+    """Current Unix time in whole seconds, without allocating a datetime."""
+    return time_ns() // 1_000_000_000
+
+
+class _TokenBucket:
+    """
+    Token bucket rate limiter allowing bursts up to ``capacity`` requests.
+    
+    Tokens refill continuously at ``refill_rate`` per second; a caller only
+    waits once the bucket is empty.
+    """
+    
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            capacity (float): Maximum number of tokens (burst size)
+            refill_rate (float): Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available if the bucket is empty."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.refill_rate
+            # Sleep without the lock so other callers can still inspect the bucket
+            time.sleep(wait)
 
 
 @dataclass
@@ -26,7 +73,7 @@ class PoolState:
     timestamp: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExchangePrice:
     """
     Data class representing price data from a specific exchange.
@@ -39,7 +86,7 @@ class ExchangePrice:
     timestamp: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ArbitrageOpportunity:
     """
     Data class representing an arbitrage opportunity.
@@ -67,24 +114,47 @@ class PoolMindSensor:
     def __init__(
         self,
         poolmind_api_url: str,
-        supported_exchanges: List[str],
+        supported_exchanges: Sequence[str],
         exchange_configs: Dict[str, Dict[str, Any]],
         hmac_secret: str,
+        executor: Optional[concurrent.futures.Executor] = None,
     ):
         """
         Initialize the PoolMind sensor.
         
         Args:
             poolmind_api_url (str): Base URL for PoolMind API
-            supported_exchanges (List[str]): List of supported exchanges
+            supported_exchanges (Sequence[str]): Supported exchanges, in polling order
             exchange_configs (Dict[str, Dict[str, Any]]): Configuration for each exchange
+            hmac_secret (str): Secret key for HMAC authentication
+            executor (Optional[concurrent.futures.Executor]): Executor used to poll
+                exchanges concurrently. Exchanges are polled sequentially if omitted.
         """
         self.poolmind_api_url = poolmind_api_url.rstrip('/')
-        self.supported_exchanges = supported_exchanges
+        self.supported_exchanges = tuple(supported_exchanges)
+        self._exchange_set = frozenset(self.supported_exchanges)
         self.exchange_configs = exchange_configs
         self.hmac_secret = hmac_secret
+        # Keyed HMAC prototype; copying it skips re-deriving the key pads per request
+        self._hmac_proto = hmac.new(hmac_secret.encode('utf-8'), digestmod=hashlib.sha256)
+        self.executor = executor
         self.session = requests.Session()
+        
+        # Exchange-specific price fetchers; add other exchanges as needed
+        self._price_fetchers: Dict[str, Callable[[], Optional[ExchangePrice]]] = {
+            "binance": self._fetch_binance_price,
+            "okx": self._fetch_okx_price,
+            "gate": self._fetch_gate_price,
+        }
+        
+        # One bucket per rate-limited exchange, allowing bursts of twice the per-second limit
+        self._rate_limiters: Dict[str, _TokenBucket] = {}
+        for exchange, config in exchange_configs.items():
+            rate = config.get("rate_limits", {}).get("requests_per_second")
+            if rate:
+                self._rate_limiters[exchange] = _TokenBucket(capacity=2 * rate, refill_rate=rate)
         self.timeout = 30
+        now = _now_epoch()
         
         # Mock data for development/testing
         self.mock_pool_state = PoolState(
@@ -93,11 +163,11 @@ class PoolMindSensor:
             total_shares=47619.0,  # 50000 / 1.05
             pool_size=52500.0,  # 50000 * 1.05
             recent_deposits=[
-                {"amount": 1000, "timestamp": int(time.time()) - 3600, "user": "SP1..."},
-                {"amount": 5000, "timestamp": int(time.time()) - 7200, "user": "SP2..."}
+                {"amount": 1000, "timestamp": now - 3600, "user": "SP1..."},
+                {"amount": 5000, "timestamp": now - 7200, "user": "SP2..."}
             ],
             recent_withdrawals=[
-                {"amount": 500, "timestamp": int(time.time()) - 1800, "user": "SP3..."}
+                {"amount": 500, "timestamp": now - 1800, "user": "SP3..."}
             ],
             performance_metrics={
                 "total_profit": 2500.0,
@@ -107,28 +177,32 @@ class PoolMindSensor:
                 "sharpe_ratio": 1.2,
                 "max_drawdown": 0.03
             },
-            timestamp=int(time.time())
+            timestamp=now
         )
         
         # Mock exchange prices for development
         self.mock_exchange_prices = {
-            "binance": ExchangePrice("binance", 2.45, 2.46, 1500000, 50000, int(time.time())),
-            "okx": ExchangePrice("okx", 2.44, 2.45, 800000, 30000, int(time.time())),
-            "gate": ExchangePrice("gate", 2.46, 2.47, 600000, 25000, int(time.time())),
-            "hotcoin": ExchangePrice("hotcoin", 2.43, 2.44, 400000, 20000, int(time.time())),
-            "bybit": ExchangePrice("bybit", 2.45, 2.46, 700000, 35000, int(time.time())),
-            "coinw": ExchangePrice("coinw", 2.47, 2.48, 300000, 15000, int(time.time())),
-            "orangex": ExchangePrice("orangex", 2.44, 2.45, 200000, 10000, int(time.time()))
+            "binance": ExchangePrice("binance", 2.45, 2.46, 1500000, 50000, now),
+            "okx": ExchangePrice("okx", 2.44, 2.45, 800000, 30000, now),
+            "gate": ExchangePrice("gate", 2.46, 2.47, 600000, 25000, now),
+            "hotcoin": ExchangePrice("hotcoin", 2.43, 2.44, 400000, 20000, now),
+            "bybit": ExchangePrice("bybit", 2.45, 2.46, 700000, 35000, now),
+            "coinw": ExchangePrice("coinw", 2.47, 2.48, 300000, 15000, now),
+            "orangex": ExchangePrice("orangex", 2.44, 2.45, 200000, 10000, now)
         }
 
-    def _generate_hmac_signature(self, method: str, path: str, body: str = "", timestamp: str = None) -> str:
+    def close(self) -> None:
+        """Close the pooled HTTP connections held by the sensor."""
+        self.session.close()
+    
+    def _generate_hmac_signature(self, method: str, path: str, body: str | bytes = "", timestamp: str = None) -> str:
         """
         Generate HMAC signature for request authentication.
         
         Args:
             method (str): HTTP method (GET, POST, etc.)
             path (str): API endpoint path
-            body (str): Request body (for POST requests)
+            body (str | bytes): Request body (for POST requests), signed as sent
             timestamp (str): Request timestamp (in milliseconds)
             
         Returns:
@@ -137,15 +211,14 @@ class PoolMindSensor:
         if timestamp is None:
             timestamp = str(int(time.time() * 1000))  # Use milliseconds
         
-        # Create message to sign: method + path + timestamp + body
-        message = f"{method.upper()}{path}{timestamp}{body}"
+        if isinstance(body, str):
+            body = body.encode('utf-8')
         
-        # Generate HMAC signature
-        signature = hmac.new(
-            self.hmac_secret.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        # Sign message: method + path + timestamp + body
+        mac = self._hmac_proto.copy()
+        mac.update(f"{method.upper()}{path}{timestamp}".encode('utf-8'))
+        mac.update(body)
+        signature = mac.hexdigest()
         
         return signature
     
@@ -172,8 +245,8 @@ class PoolMindSensor:
         url = f"{self.poolmind_api_url}{endpoint}"
         timestamp = str(int(time.time() * 1000))  # Use milliseconds
         
-        # Prepare request body
-        body = json.dumps(data) if data else ""
+        # Prepare request body; the exact bytes sent are the bytes signed
+        body = orjson.dumps(data) if data else b""
         
         # Generate HMAC signature
         signature = self._generate_hmac_signature(method, endpoint, body, timestamp)
@@ -211,7 +284,7 @@ class PoolMindSensor:
                 data=None
             )
             if response.status_code == 200:
-                pool_data = response.json()
+                pool_data = orjson.loads(response.content)
                 return {
                     "current_nav": pool_data.get("nav", 1.0),
                     "available_stx": pool_data.get("available_stx", 0),
@@ -219,7 +292,7 @@ class PoolMindSensor:
                     "pool_size": pool_data.get("pool_size", 0),
                     "recent_activity": pool_data.get("recent_activity", []),
                     "performance": pool_data.get("performance", {}),
-                    "timestamp": int(time.time())
+                    "timestamp": _now_epoch()
                 }
         except Exception as e:
             logger.warning(f"Failed to fetch pool state from API: {e}, using mock data")
@@ -238,35 +311,66 @@ class PoolMindSensor:
             "timestamp": self.mock_pool_state.timestamp
         }
     
-    def get_exchange_prices(self) -> Dict[str, ExchangePrice]:
+    def get_exchange_prices(self, exchanges: Optional[Sequence[str]] = None) -> Dict[str, ExchangePrice]:
+        """
+        Get current STX prices from all supported exchanges, or a subset of them.
+        
+        When the sensor was given an executor, the exchanges are queried
+        concurrently so a poll takes as long as the slowest exchange rather
+        than the sum of all of them. The executor's worker count bounds how
+        many requests are in flight, and each exchange's rate limiter still
+        spaces out requests to the same exchange.
+        
+        Args:
+            exchanges (Optional[Sequence[str]]): Exchanges to poll. Defaults to all supported exchanges.
+        
+        Returns:
+            Dict[str, ExchangePrice]: Price data from each exchange, in the requested order
+        """
+        if exchanges is None:
+            exchanges = self.supported_exchanges
+        
+        if self.executor is None:
+            return {
+                exchange: self._get_exchange_price(exchange)
+                for exchange in exchanges
+            }
+        
+        futures = {
+            self.executor.submit(self._get_exchange_price, exchange): exchange
+            for exchange in exchanges
+        }
+        
+        collected = {}
+        for future in concurrent.futures.as_completed(futures):
+            collected[futures[future]] = future.result()
+        
+        # Keep the requested exchange order so downstream pair comparisons are deterministic
+        return {exchange: collected[exchange] for exchange in exchanges}
+    
+    def _get_exchange_price(self, exchange: str) -> ExchangePrice:
         """
-        Get current STX prices from all supported exchanges.
+        Get the current STX price from a single exchange, falling back to mock data.
         
+        Args:
+            exchange (str): Exchange name
+            
         Returns:
-            Dict[str, ExchangePrice]: Price data from each exchange
+            ExchangePrice: Price data for the exchange
         """
-        exchange_prices = {}
-        
-        for exchange in self.supported_exchanges:
-            try:
-                # Try to fetch real price data
-                price_data = self._fetch_exchange_price(exchange)
-                if price_data:
-                    exchange_prices[exchange] = price_data
-                else:
-                    # Use mock data as fallback
-                    exchange_prices[exchange] = self.mock_exchange_prices.get(
-                        exchange, 
-                        ExchangePrice(exchange, 2.45, 2.46, 100000, 10000, int(time.time()))
-                    )
-            except Exception as e:
-                logger.warning(f"Failed to fetch price from {exchange}: {e}, using mock data")
-                exchange_prices[exchange] = self.mock_exchange_prices.get(
-                    exchange,
-                    ExchangePrice(exchange, 2.45, 2.46, 100000, 10000, int(time.time()))
-                )
-        
-        return exchange_prices
+        try:
+            # Try to fetch real price data
+            price_data = self._fetch_exchange_price(exchange)
+            if price_data:
+                return price_data
+        except Exception as e:
+            logger.warning(f"Failed to fetch price from {exchange}: {e}, using mock data")
+        
+        # Use mock data as fallback
+        return self.mock_exchange_prices.get(
+            exchange,
+            ExchangePrice(exchange, 2.45, 2.46, 100000, 10000, _now_epoch())
+        )
     
     def _fetch_exchange_price(self, exchange: str) -> Optional[ExchangePrice]:
         """
@@ -278,23 +382,28 @@ class PoolMindSensor:
         Returns:
             Optional[ExchangePrice]: Price data if successful, None otherwise
         """
+        if exchange not in self._exchange_set:
+            return None
+        
         config = self.exchange_configs.get(exchange, {})
         api_endpoint = config.get("api_endpoint")
         
         if not api_endpoint:
             return None
         
+        # This is a placeholder - in real implementation, each exchange
+        # would have its own API integration
+        fetch_price = self._price_fetchers.get(exchange)
+        if fetch_price is None:
+            # Nothing is requested, so don't spend a rate limit token
+            return None
+        
+        rate_limiter = self._rate_limiters.get(exchange)
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        
         try:
-            # This is a placeholder - in real implementation, each exchange
-            # would have its own API integration
-            if exchange == "binance":
-                return self._fetch_binance_price()
-            elif exchange == "okx":
-                return self._fetch_okx_price()
-            elif exchange == "gate":
-                return self._fetch_gate_price()
-            # Add other exchanges as needed
-            
+            return fetch_price()
         except Exception as e:
             logger.error(f"Error fetching price from {exchange}: {e}")
             return None
@@ -304,7 +413,7 @@ class PoolMindSensor:
         try:
             # Placeholder for Binance API integration
             # In real implementation, this would call Binance API
-            return ExchangePrice("binance", 2.45, 2.46, 1500000, 50000, int(time.time()))
+            return ExchangePrice("binance", 2.45, 2.46, 1500000, 50000, _now_epoch())
         except Exception:
             return None
     
@@ -312,7 +421,7 @@ class PoolMindSensor:
         """Fetch STX price from OKX."""
         try:
             # Placeholder for OKX API integration
-            return ExchangePrice("okx", 2.44, 2.45, 800000, 30000, int(time.time()))
+            return ExchangePrice("okx", 2.44, 2.45, 800000, 30000, _now_epoch())
         except Exception:
             return None
     
@@ -320,7 +429,7 @@ class PoolMindSensor:
         """Fetch STX price from Gate.io."""
         try:
             # Placeholder for Gate.io API integration
-            return ExchangePrice("gate", 2.46, 2.47, 600000, 25000, int(time.time()))
+            return ExchangePrice("gate", 2.46, 2.47, 600000, 25000, _now_epoch())
         except Exception:
             return None
     
@@ -328,104 +437,109 @@ class PoolMindSensor:
         """
         Identify arbitrage opportunities across exchanges.
         
+        Every ordered (buy, sell) exchange pair is evaluated in one vectorized
+        pass over the polled prices.
+        
         Returns:
             List[ArbitrageOpportunity]: List of identified opportunities
         """
         exchange_prices = self.get_exchange_prices()
-        opportunities = []
+        prices = list(exchange_prices.values())
         
-        # Compare all exchange pairs
-        exchanges = list(exchange_prices.keys())
-        for i, buy_exchange in enumerate(exchanges):
-            for sell_exchange in exchanges[i+1:]:
-                buy_price = exchange_prices[buy_exchange]
-                sell_price = exchange_prices[sell_exchange]
-                
-                # Check if buying from buy_exchange and selling to sell_exchange is profitable
-                profit_pct = ((sell_price.bid - buy_price.ask) / buy_price.ask) * 100
-                
-                if profit_pct > 0.1:  # Minimum 0.1% profit to consider
-                    # Calculate trade size based on liquidity
-                    max_trade_size = min(buy_price.liquidity_depth, sell_price.liquidity_depth) * 0.1
-                    
-                    opportunity = ArbitrageOpportunity(
-                        buy_exchange=buy_exchange.exchange,
-                        sell_exchange=sell_exchange.exchange,
-                        buy_price=buy_price.ask,
-                        sell_price=sell_price.bid,
-                        profit_percentage=profit_pct,
-                        required_amount=max_trade_size,
-                        expected_profit=max_trade_size * (sell_price.bid - buy_price.ask),
-                        risk_score=self._calculate_risk_score(buy_price, sell_price),
-                        execution_time_estimate=300,  # 5 minutes estimate
-                        timestamp=int(time.time())
-                    )
-                    opportunities.append(opportunity)
-                
-                # Check reverse direction
-                reverse_profit_pct = ((buy_price.bid - sell_price.ask) / sell_price.ask) * 100
-                
-                if reverse_profit_pct > 0.1:
-                    max_trade_size = min(sell_price.liquidity_depth, buy_price.liquidity_depth) * 0.1
-                    
-                    opportunity = ArbitrageOpportunity(
-                        buy_exchange=sell_exchange.exchange,
-                        sell_exchange=buy_exchange.exchange,
-                        buy_price=sell_price.ask,
-                        sell_price=buy_price.bid,
-                        profit_percentage=reverse_profit_pct,
-                        required_amount=max_trade_size,
-                        expected_profit=max_trade_size * (buy_price.bid - sell_price.ask),
-                        risk_score=self._calculate_risk_score(sell_price, buy_price),
-                        execution_time_estimate=300,
-                        timestamp=int(time.time())
-                    )
-                    opportunities.append(opportunity)
-        
-        # Sort by profit percentage (descending)
-        opportunities.sort(key=lambda x: x.profit_percentage, reverse=True)
+        if len(prices) < 2:
+            return []
+        
+        bids = np.array([price.bid for price in prices], dtype=np.float64)
+        asks = np.array([price.ask for price in prices], dtype=np.float64)
+        volumes = np.array([price.volume_24h for price in prices], dtype=np.float64)
+        liquidity = np.array([price.liquidity_depth for price in prices], dtype=np.float64)
+        
+        # profit_pct[i, j]: buy on exchange i at its ask, sell on exchange j at its bid
+        profit_pct = (bids[None, :] - asks[:, None]) / asks[:, None] * 100
+        np.fill_diagonal(profit_pct, -np.inf)
+        
+        # Trade size is bounded by the shallower order book of the pair
+        trade_sizes = np.minimum.outer(liquidity, liquidity) * 0.1
+        risk_scores = self._calculate_risk_scores_batch(bids, asks, volumes, liquidity)
+        
+        # Minimum 0.1% profit to consider, sorted by profit percentage (descending)
+        buy_idx, sell_idx = np.nonzero(profit_pct > 0.1)
+        order = np.argsort(-profit_pct[buy_idx, sell_idx], kind="stable")
+        
+        timestamp = _now_epoch()
+        opportunities = []
+        for i, j in zip(buy_idx[order].tolist(), sell_idx[order].tolist()):
+            opportunities.append(ArbitrageOpportunity(
+                buy_exchange=prices[i].exchange,
+                sell_exchange=prices[j].exchange,
+                buy_price=prices[i].ask,
+                sell_price=prices[j].bid,
+                profit_percentage=float(profit_pct[i, j]),
+                required_amount=float(trade_sizes[i, j]),
+                expected_profit=float(trade_sizes[i, j] * (bids[j] - asks[i])),
+                risk_score=int(risk_scores[i, j]),
+                execution_time_estimate=300,  # 5 minutes estimate
+                timestamp=timestamp
+            ))
         
         return opportunities
     
-    def _calculate_risk_score(self, buy_price: ExchangePrice, sell_price: ExchangePrice) -> int:
+    def _calculate_risk_scores_batch(
+        self,
+        bids: np.ndarray,
+        asks: np.ndarray,
+        volumes: np.ndarray,
+        liquidity: np.ndarray
+    ) -> np.ndarray:
         """
-        Calculate risk score for an arbitrage opportunity.
+        Calculate risk scores for every ordered pair of exchanges.
         
         Args:
-            buy_price (ExchangePrice): Buy exchange price data
-            sell_price (ExchangePrice): Sell exchange price data
+            bids (np.ndarray): Bid price per exchange, shape (N,)
+            asks (np.ndarray): Ask price per exchange, shape (N,)
+            volumes (np.ndarray): 24h volume per exchange, shape (N,)
+            liquidity (np.ndarray): Liquidity depth per exchange, shape (N,)
             
         Returns:
-            int: Risk score (1-10, where 1 is lowest risk)
+            np.ndarray: int8 risk scores of shape (N, N) where [i, j] scores buying
+                on exchange i and selling on exchange j (1-10, where 1 is lowest risk)
         """
         # Base risk score
-        risk_score = 3
+        risk_scores = np.full((len(bids), len(bids)), 3, dtype=np.int8)
         
         # Adjust based on liquidity
-        min_liquidity = min(buy_price.liquidity_depth, sell_price.liquidity_depth)
-        if min_liquidity < 10000:
-            risk_score += 2
-        elif min_liquidity < 20000:
-            risk_score += 1
+        min_liquidity = np.minimum.outer(liquidity, liquidity)
+        risk_scores += np.select([min_liquidity < 10000, min_liquidity < 20000], [2, 1], 0).astype(np.int8)
         
         # Adjust based on volume
-        min_volume = min(buy_price.volume_24h, sell_price.volume_24h)
-        if min_volume < 100000:
-            risk_score += 2
-        elif min_volume < 500000:
-            risk_score += 1
-        
-        # Adjust based on spread
-        buy_spread = (buy_price.ask - buy_price.bid) / buy_price.bid
-        sell_spread = (sell_price.ask - sell_price.bid) / sell_price.bid
-        avg_spread = (buy_spread + sell_spread) / 2
-        
-        if avg_spread > 0.01:  # 1% spread
-            risk_score += 2
-        elif avg_spread > 0.005:  # 0.5% spread
-            risk_score += 1
-        
-        return min(risk_score, 10)  # Cap at 10
+        min_volume = np.minimum.outer(volumes, volumes)
+        risk_scores += np.select([min_volume < 100000, min_volume < 500000], [2, 1], 0).astype(np.int8)
+        
+        # Adjust based on spread (1% and 0.5% thresholds)
+        spreads = (asks - bids) / bids
+        avg_spread = (spreads[:, None] + spreads[None, :]) / 2
+        risk_scores += np.select([avg_spread > 0.01, avg_spread > 0.005], [2, 1], 0).astype(np.int8)
+        
+        return np.clip(risk_scores, 1, 10)  # Cap at 10
+    
+    def _calculate_risk_score(self, buy_price: ExchangePrice, sell_price: ExchangePrice) -> int:
+        """
+        Calculate risk score for an arbitrage opportunity.
+        
+        Args:
+            buy_price (ExchangePrice): Buy exchange price data
+            sell_price (ExchangePrice): Sell exchange price data
+            
+        Returns:
+            int: Risk score (1-10, where 1 is lowest risk)
+        """
+        risk_scores = self._calculate_risk_scores_batch(
+            np.array([buy_price.bid, sell_price.bid], dtype=np.float64),
+            np.array([buy_price.ask, sell_price.ask], dtype=np.float64),
+            np.array([buy_price.volume_24h, sell_price.volume_24h], dtype=np.float64),
+            np.array([buy_price.liquidity_depth, sell_price.liquidity_depth], dtype=np.float64)
+        )
+        return int(risk_scores[0, 1])
     
     def get_market_metrics(self) -> Dict[str, Any]:
         """
@@ -454,7 +568,7 @@ class PoolMindSensor:
             "total_liquidity": total_liquidity,
             "exchange_count": len(exchange_prices),
             "price_spread": max(all_prices) - min(all_prices),
-            "timestamp": int(time.time())
+            "timestamp": _now_epoch()
         }
     
     def get_metric_fn(self, metric_name: str = "pool_state"):
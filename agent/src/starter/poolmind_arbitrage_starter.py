@@ -6,14 +6,15 @@ This script initializes and runs the PoolMind arbitrage agent for STX trading
 across multiple exchanges with automatic fund management and profit reporting.
 """
 
+import concurrent.futures
 import os
+import secrets
 import sys
-import time
 import signal
+import threading
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from loguru import logger
-from datetime import datetime, timedelta
 
 # Add the parent directory to the path to import from src
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -24,10 +25,8 @@ from src.client.poolmind import PoolMindClient
 from src.client.rag import RAGClient
 from src.flows.poolmind_arbitrage import poolmind_arbitrage_flow, poolmind_monitoring_flow
 from src.genner import get_genner
-from src.db.interface import DBInterface
 from src.db.sqlite import SQLiteDB
 from src.container import ContainerManager
-from src.helper import nanoid
 
 import docker
 from anthropic import Anthropic
@@ -38,6 +37,48 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+_STDERR_FMT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+_FILE_FMT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+
+_sink_added = False
+
+# Exchange -> (API endpoint, requests per second, minimum order size)
+_EXCHANGE_DEFAULTS = {
+    "binance": ("https://api.binance.com", 10, 10),
+    "okx": ("https://www.okx.com", 20, 1),
+    "gate": ("https://api.gateio.ws", 100, 1),
+    "hotcoin": ("https://api.hotcoin.com", 10, 10),
+    "bybit": ("https://api.bybit.com", 50, 1),
+    "coinw": ("https://api.coinw.com", 20, 1),
+    "orangex": ("https://api.orangex.com", 10, 1),
+}
+
+
+def _ensure_log_sink():
+    """
+    Add the rotating file log sink, creating its directory on first use.
+    
+    This is deferred until the configuration has loaded so short-lived runs
+    (e.g. failing validation) don't touch the filesystem, and is guarded so
+    restarting the agent in-process never adds a duplicate sink.
+    """
+    global _sink_added
+    if _sink_added:
+        return
+    
+    log_file = os.getenv("POOLMIND_LOG_FILE", "logs/poolmind_arbitrage.log")
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    logger.add(
+        log_file,
+        rotation="100 MB",
+        retention="30 days",
+        format=_FILE_FMT,
+        level=os.getenv("POOLMIND_LOG_LEVEL", "INFO"),
+        colorize=False,
+        enqueue=True,
+    )
+    _sink_added = True
+
 
 class PoolMindArbitrageStarter:
     """
@@ -50,8 +91,12 @@ class PoolMindArbitrageStarter:
     def __init__(self):
         """Initialize the PoolMind arbitrage starter."""
         self.agent_id = os.getenv("POOLMIND_AGENT_ID", "poolmind-arbitrage-agent")
-        self.session_id = f"{self.agent_id}-{nanoid(8)}"
+        self.session_id = f"{self.agent_id}-{secrets.token_urlsafe(6)}"
         self.running = True
+        self._stop_event = threading.Event()
+        
+        # Components of the current run, released by close()
+        self._components: Dict[str, Any] | None = None
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -64,6 +109,9 @@ class PoolMindArbitrageStarter:
         """Handle shutdown signals gracefully."""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
+        # Only flag the shutdown here: the handler runs on the main thread and
+        # may interrupt a database write, so buffered rows are flushed by close()
+        self._stop_event.set()
     
     def _load_environment_config(self) -> Dict[str, Any]:
         """
@@ -84,10 +132,10 @@ class PoolMindArbitrageStarter:
             "poolmind_hmac_secret": os.getenv("POOLMIND_HMAC_SECRET"),
             
             # Trading Configuration
-            "supported_exchanges": os.getenv(
+            "supported_exchanges": self._parse_exchanges(os.getenv(
                 "POOLMIND_SUPPORTED_EXCHANGES", 
                 "binance,okx,gate,hotcoin,bybit,coinw,orangex"
-            ).split(","),
+            )),
             "min_profit_threshold": float(os.getenv("POOLMIND_MIN_PROFIT_THRESHOLD", "0.5")),
             "max_trade_size_percent": float(os.getenv("POOLMIND_MAX_TRADE_SIZE_PERCENT", "10.0")),
             "stop_loss_threshold": float(os.getenv("POOLMIND_STOP_LOSS_THRESHOLD", "5.0")),
@@ -108,6 +156,7 @@ class PoolMindArbitrageStarter:
             # Monitoring Configuration
             "monitoring_interval": int(os.getenv("POOLMIND_MONITORING_INTERVAL", "60")),
             "continuous_mode": os.getenv("POOLMIND_CONTINUOUS_MODE", "false").lower() == "true",
+            "max_concurrent_polls": int(os.getenv("POOLMIND_MAX_CONCURRENT_POLLS", "8")),
         }
         
         # Validate required configuration
@@ -118,72 +167,45 @@ class PoolMindArbitrageStarter:
         
         return config
     
+    @staticmethod
+    def _parse_exchanges(raw: str) -> Tuple[str, ...]:
+        """
+        Parse a comma-separated exchange list, ignoring whitespace and empty entries.
+        
+        Args:
+            raw (str): Comma-separated exchange names, e.g. "binance, okx"
+            
+        Returns:
+            Tuple[str, ...]: Exchange names in their configured order
+        """
+        return tuple(name for name in map(str.strip, raw.split(",")) if name)
+    
     def _load_exchange_configs(self) -> Dict[str, Dict[str, Any]]:
         """
         Load exchange-specific configurations.
         
+        Credentials are read from ``<EXCHANGE>_API_KEY`` / ``<EXCHANGE>_API_SECRET``
+        (plus ``OKX_PASSPHRASE``), each looked up once.
+        
         Returns:
             Dict[str, Dict[str, Any]]: Exchange configurations
         """
-        return {
-            "binance": {
-                "api_endpoint": "https://api.binance.com",
-                "api_key": os.getenv("BINANCE_API_KEY"),
-                "api_secret": os.getenv("BINANCE_API_SECRET"),
-                "rate_limits": {"requests_per_second": 10},
-                "supported_pairs": ["STX/USDT"],
-                "min_order_size": 10,
-            },
-            "okx": {
-                "api_endpoint": "https://www.okx.com",
-                "api_key": os.getenv("OKX_API_KEY"),
-                "api_secret": os.getenv("OKX_API_SECRET"),
-                "passphrase": os.getenv("OKX_PASSPHRASE"),
-                "rate_limits": {"requests_per_second": 20},
-                "supported_pairs": ["STX/USDT"],
-                "min_order_size": 1,
-            },
-            "gate": {
-                "api_endpoint": "https://api.gateio.ws",
-                "api_key": os.getenv("GATE_API_KEY"),
-                "api_secret": os.getenv("GATE_API_SECRET"),
-                "rate_limits": {"requests_per_second": 100},
+        configs = {}
+        for exchange, (api_endpoint, requests_per_second, min_order_size) in _EXCHANGE_DEFAULTS.items():
+            prefix = exchange.upper()
+            config = {
+                "api_endpoint": api_endpoint,
+                "api_key": os.getenv(f"{prefix}_API_KEY"),
+                "api_secret": os.getenv(f"{prefix}_API_SECRET"),
+                "rate_limits": {"requests_per_second": requests_per_second},
                 "supported_pairs": ["STX/USDT"],
-                "min_order_size": 1,
-            },
-            "hotcoin": {
-                "api_endpoint": "https://api.hotcoin.com",
-                "api_key": os.getenv("HOTCOIN_API_KEY"),
-                "api_secret": os.getenv("HOTCOIN_API_SECRET"),
-                "rate_limits": {"requests_per_second": 10},
-                "supported_pairs": ["STX/USDT"],
-                "min_order_size": 10,
-            },
-            "bybit": {
-                "api_endpoint": "https://api.bybit.com",
-                "api_key": os.getenv("BYBIT_API_KEY"),
-                "api_secret": os.getenv("BYBIT_API_SECRET"),
-                "rate_limits": {"requests_per_second": 50},
-                "supported_pairs": ["STX/USDT"],
-                "min_order_size": 1,
-            },
-            "coinw": {
-                "api_endpoint": "https://api.coinw.com",
-                "api_key": os.getenv("COINW_API_KEY"),
-                "api_secret": os.getenv("COINW_API_SECRET"),
-                "rate_limits": {"requests_per_second": 20},
-                "supported_pairs": ["STX/USDT"],
-                "min_order_size": 1,
-            },
-            "orangex": {
-                "api_endpoint": "https://api.orangex.com",
-                "api_key": os.getenv("ORANGEX_API_KEY"),
-                "api_secret": os.getenv("ORANGEX_API_SECRET"),
-                "rate_limits": {"requests_per_second": 10},
-                "supported_pairs": ["STX/USDT"],
-                "min_order_size": 1,
-            },
-        }
+                "min_order_size": min_order_size,
+            }
+            if exchange == "okx":
+                config["passphrase"] = os.getenv("OKX_PASSPHRASE")
+            configs[exchange] = config
+        
+        return configs
     
     def _initialize_components(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -197,10 +219,26 @@ class PoolMindArbitrageStarter:
         """
         components = {}
         
+        # Initialize exchange polling executor
+        logger.info("Initializing exchange polling executor...")
+        components["executor"] = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(len(config["supported_exchanges"]), config["max_concurrent_polls"])),
+            thread_name_prefix="poolmind-exchange"
+        )
+        
+        # The flow's own lookups (e.g. RAG) get a separate pool so they never take
+        # a slot reserved for exchange polls
+        components["flow_executor"] = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="poolmind-flow"
+        )
+        
         # Initialize database
         logger.info("Initializing database...")
         os.makedirs(os.path.dirname(config["database_path"]), exist_ok=True)
-        components["db"] = SQLiteDB(config["database_path"])
+        # The PoolMind database file is not shared with other agents, so it can use
+        # WAL; chat history is buffered because the flow flushes after every cycle
+        components["db"] = SQLiteDB(config["database_path"], wal=True, buffer_writes=True)
         
         # Initialize RAG client
         logger.info("Initializing RAG client...")
@@ -216,7 +254,8 @@ class PoolMindArbitrageStarter:
             poolmind_api_url=config["poolmind_api_url"],
             supported_exchanges=config["supported_exchanges"],
             exchange_configs=config["exchange_configs"],
-            hmac_secret=config["poolmind_hmac_secret"]
+            hmac_secret=config["poolmind_hmac_secret"],
+            executor=components["executor"]
         )
         
         # Initialize PoolMind client
@@ -224,7 +263,9 @@ class PoolMindArbitrageStarter:
         components["poolmind_client"] = PoolMindClient(
             base_url=config["poolmind_api_url"],
             agent_id=self.agent_id,
-            hmac_secret=config["poolmind_hmac_secret"]
+            hmac_secret=config["poolmind_hmac_secret"],
+            # Both talk to the PoolMind API, so share the sensor's connection pool
+            session=components["sensor"].session
         )
         
         # Initialize LLM generator
@@ -265,6 +306,34 @@ class PoolMindArbitrageStarter:
         
         return components
     
+    def close(self):
+        """
+        Release the components of the current run (executors, HTTP sessions,
+        database and Docker client).
+        
+        run() calls this on the way out; calling it more than once is a no-op.
+        """
+        components = self._components
+        if components is None:
+            return
+        
+        self._components = None
+        
+        closers = [
+            lambda: components["executor"].shutdown(wait=False, cancel_futures=True),
+            lambda: components["flow_executor"].shutdown(wait=False, cancel_futures=True),
+            components["sensor"].close,
+            components["poolmind_client"].close,
+            components["db"].close,
+            components["container_manager"].close,
+        ]
+        # A failure in one (e.g. the database's final flush) must not leak the rest
+        for close_component in closers:
+            try:
+                close_component()
+            except Exception as e:
+                logger.error(f"Error while closing components: {e}")
+    
     def _initialize_genner(self, config: Dict[str, Any]):
         """
         Initialize the LLM generator based on configuration.
@@ -321,7 +390,8 @@ class PoolMindArbitrageStarter:
                 prev_strat=None,  # Could be enhanced to fetch previous strategy
                 notif_str="STX arbitrage opportunity monitoring",
                 poolmind_client=components["poolmind_client"],
-                summarizer=summarizer
+                summarizer=summarizer,
+                executor=components["flow_executor"]
             )
             logger.info("Single arbitrage cycle completed successfully")
         except Exception as e:
@@ -342,7 +412,9 @@ class PoolMindArbitrageStarter:
                 agent=components["agent"],
                 session_id=self.session_id,
                 poolmind_client=components["poolmind_client"],
-                monitoring_interval=config["monitoring_interval"]
+                monitoring_interval=config["monitoring_interval"],
+                stop_event=self._stop_event,
+                executor=components["flow_executor"],
             )
         except Exception as e:
             logger.error(f"Error in continuous monitoring: {e}")
@@ -351,14 +423,19 @@ class PoolMindArbitrageStarter:
         """
         Main execution method for the PoolMind arbitrage agent.
         """
+        # A signal received during a previous run must not end this one
+        self.running = True
+        self._stop_event.clear()
+        
         try:
             # Load configuration
             logger.info("Loading configuration...")
             config = self._load_environment_config()
+            _ensure_log_sink()
             
             # Initialize components
             logger.info("Initializing components...")
-            components = self._initialize_components(config)
+            components = self._components = self._initialize_components(config)
             
             # Log startup information
             logger.info(f"PoolMind Arbitrage Agent started successfully!")
@@ -381,6 +458,7 @@ class PoolMindArbitrageStarter:
             logger.error(f"Fatal error: {e}")
             sys.exit(1)
         finally:
+            self.close()
             logger.info("PoolMind Arbitrage Agent shutdown complete")
 
 
@@ -390,26 +468,24 @@ def main():
     """
     # Configure logging
     logger.remove()
+    # Colour markup is only worth parsing when a terminal will render it
+    is_tty = sys.stderr.isatty()
     logger.add(
         sys.stderr,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="INFO"
+        format=_STDERR_FMT if is_tty else _FILE_FMT,
+        colorize=is_tty,
+        level="INFO",
+        enqueue=True,
     )
     
-    # Add file logging
-    log_file = os.getenv("POOLMIND_LOG_FILE", "logs/poolmind_arbitrage.log")
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
-    logger.add(
-        log_file,
-        rotation="100 MB",
-        retention="30 days",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="DEBUG"
-    )
+    # File logging is added by the starter once configuration has loaded
     
     # Create and run the starter
     starter = PoolMindArbitrageStarter()
-    starter.run()
+    try:
+        starter.run()
+    finally:
+        logger.complete()
 
 
 if __name__ == "__main__":
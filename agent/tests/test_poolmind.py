@@ -1,7 +1,11 @@
 import pytest
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch, MagicMock
+import numpy as np
+import orjson
 from datetime import datetime
 from pathlib import Path
 
@@ -9,9 +13,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.agent.poolmind_arbitrage import PoolMindArbitrageAgent, PoolMindArbitragePromptGenerator
-from src.sensor.poolmind import PoolMindSensor, PoolState, ExchangePrice, ArbitrageOpportunity
-from src.client.poolmind import PoolMindClient, FundRequest, ProfitReport
+from src.sensor.poolmind import PoolMindSensor, PoolState, ExchangePrice, ArbitrageOpportunity, _TokenBucket
+from src.client.poolmind import PoolMindClient
 from src.datatypes.poolmind import PoolMindArbitrageState, PoolMetrics, ArbitrageOpportunityData
+from src.flows.poolmind_arbitrage import poolmind_monitoring_flow
 
 
 class TestPoolMindArbitragePromptGenerator:
@@ -25,6 +30,14 @@ class TestPoolMindArbitragePromptGenerator:
         assert "market_analysis_prompt" in generator.prompts
         assert "arbitrage_strategy_prompt" in generator.prompts
     
+    def test_default_prompts_are_shared_and_read_only(self):
+        """Test default prompts are built once and cannot be mutated."""
+        first = PoolMindArbitragePromptGenerator()
+        second = PoolMindArbitragePromptGenerator()
+        assert first.prompts is second.prompts
+        with pytest.raises(TypeError):
+            first.prompts["system_prompt"] = "Overridden"
+
     def test_init_with_custom_prompts(self):
         """Test initialization with custom prompts."""
         custom_prompts = {
@@ -54,12 +67,26 @@ class TestPoolMindArbitragePromptGenerator:
             exchanges="binance,okx",
             min_profit_threshold=0.5,
             available_stx=1000,
-            current_nav=1.05
+            current_nav=1.05,
+            pool_size=1050,
+            max_trade_size=10.0,
+            risk_limit="medium",
+            stop_loss_threshold=5.0
         )
         assert "binance,okx" in prompt
         assert "0.5" in prompt
         assert "1000" in prompt
         assert "1.05" in prompt
+    
+    def test_compiled_prompts_match_str_format(self):
+        """Test pre-parsed prompts render identically to str.format."""
+        generator = PoolMindArbitragePromptGenerator()
+        variables = {
+            "market_analysis_results": "{no substitution here}",
+            "min_profit_threshold": 0.5
+        }
+        expected = generator.prompts["arbitrage_strategy_prompt"].format(**variables)
+        assert generator.get_arbitrage_strategy_prompt(**variables) == expected
 
 
 class TestPoolMindSensor:
@@ -92,22 +119,44 @@ class TestPoolMindSensor:
         assert "total_shares" in pool_state
         assert pool_state["current_nav"] > 0
     
-    @patch('requests.get')
-    def test_get_pool_state_api_success(self, mock_get):
+    def test_get_pool_state_api_success(self):
         """Test getting pool state from API when successful."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "nav": 1.1,
             "available_stx": 2000,
             "total_shares": 1818,
             "pool_size": 2200
-        }
-        mock_get.return_value = mock_response
+        })
         
-        pool_state = self.sensor.get_pool_state()
+        with patch.object(self.sensor.session, "request", return_value=mock_response) as mock_request:
+            pool_state = self.sensor.get_pool_state()
+        
+        mock_request.assert_called_once()
         assert pool_state["current_nav"] == 1.1
         assert pool_state["available_stx"] == 2000
+        assert pool_state["total_shares"] == 1818
+        assert pool_state["pool_size"] == 2200
+    
+    def test_authenticated_request_wire_format(self):
+        """Test the sensor sends and signs the same compact body as the client."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        
+        with (
+            patch("src.sensor.poolmind.time.time", return_value=1700000000.0),
+            patch.object(self.sensor.session, "request", return_value=mock_response) as mock_request,
+        ):
+            self.sensor._make_authenticated_request(
+                "POST",
+                "/api/v1/test",
+                {"recipient_address": "SP000", "amount": 100.5, "memo": "arb"}
+            )
+        
+        kwargs = mock_request.call_args.kwargs
+        assert kwargs["data"] == b'{"recipient_address":"SP000","amount":100.5,"memo":"arb"}'
+        assert kwargs["headers"]["x-signature"] == "sha256=b93d9b0be039e323684de7e3a53e636e5c99a52e61346f88850ad93c0a85f5ef"
     
     def test_get_exchange_prices(self):
         """Test getting exchange prices."""
@@ -123,6 +172,24 @@ class TestPoolMindSensor:
             assert price.bid > 0
             assert price.ask > 0
     
+    def test_get_exchange_prices_with_executor(self):
+        """Test concurrent exchange polling keeps the configured exchange order."""
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            self.sensor.executor = executor
+            prices = self.sensor.get_exchange_prices()
+        
+        assert list(prices.keys()) == ["binance", "okx", "gate"]
+        for exchange, price in prices.items():
+            assert price.exchange == exchange
+    
+    def test_get_exchange_prices_subset(self):
+        """Test polling a subset of exchanges keeps the requested order."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.sensor.executor = executor
+            prices = self.sensor.get_exchange_prices(["gate", "binance"])
+        
+        assert list(prices.keys()) == ["gate", "binance"]
+    
     def test_identify_arbitrage_opportunities(self):
         """Test identifying arbitrage opportunities."""
         opportunities = self.sensor.identify_arbitrage_opportunities()
@@ -141,6 +208,71 @@ class TestPoolMindSensor:
         assert isinstance(risk_score, int)
         assert 1 <= risk_score <= 10
     
+    def test_calculate_risk_scores_batch(self):
+        """Test batched risk scores against hand-computed values at the threshold boundaries."""
+        # A: deep book, no spread
+        # B: liquidity 20000, volume 500000 and spread 1% sit exactly on the thresholds
+        # C: just under the low liquidity/volume thresholds, 2.5% spread
+        # D: liquidity 10000 and volume 100000 sit exactly on the lower thresholds
+        bids = np.array([100.0, 100.0, 100.0, 100.0])
+        asks = np.array([100.0, 101.0, 102.5, 100.0])
+        volumes = np.array([1000000.0, 500000.0, 99999.0, 100000.0])
+        liquidity = np.array([50000.0, 20000.0, 9999.0, 10000.0])
+        
+        risk_scores = self.sensor._calculate_risk_scores_batch(bids, asks, volumes, liquidity)
+        
+        np.testing.assert_array_equal(risk_scores, [
+            [3, 3, 9, 5],
+            [3, 4, 9, 5],
+            [9, 9, 9, 9],
+            [5, 5, 9, 5],
+        ])
+    
+    def test_calculate_risk_score_pair(self):
+        """Test the per-pair risk score for a hand-built opportunity."""
+        now = int(datetime.now().timestamp())
+        buy_price = ExchangePrice("binance", 100.0, 101.0, 500000, 20000, now)
+        sell_price = ExchangePrice("okx", 100.0, 100.0, 100000, 10000, now)
+        
+        # +1 for liquidity 10000, +1 for volume 100000, average spread 0.5% adds nothing
+        assert self.sensor._calculate_risk_score(buy_price, sell_price) == 5
+        assert self.sensor._calculate_risk_score(buy_price, buy_price) == 4
+    
+    @patch('src.sensor.poolmind.time.sleep')
+    def test_token_bucket_allows_burst_then_waits(self, mock_sleep):
+        """Test the rate limiter only sleeps once the burst capacity is used."""
+        bucket = _TokenBucket(capacity=2, refill_rate=10)
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+        
+        # The mocked sleep doesn't advance the clock, so refill the bucket from it
+        mock_sleep.side_effect = lambda _: setattr(bucket, "tokens", 1)
+        bucket.acquire()
+        mock_sleep.assert_called_once()
+        assert 0 < mock_sleep.call_args[0][0] <= 0.1
+    
+    def test_exchange_without_fetcher_does_not_use_rate_limit(self):
+        """Test exchanges with no price fetcher fall back without taking a token."""
+        sensor = PoolMindSensor(
+            poolmind_api_url="http://localhost:3000",
+            supported_exchanges=["hotcoin"],
+            exchange_configs={
+                "hotcoin": {
+                    "api_endpoint": "https://api.hotcoin.com",
+                    "rate_limits": {"requests_per_second": 1}
+                }
+            },
+            hmac_secret="test-secret"
+        )
+        bucket = sensor._rate_limiters["hotcoin"]
+        
+        with patch.object(bucket, "acquire") as mock_acquire:
+            prices = sensor.get_exchange_prices()
+        
+        mock_acquire.assert_not_called()
+        assert prices["hotcoin"] == sensor.mock_exchange_prices["hotcoin"]
+    
     def test_get_metric_fn(self):
         """Test getting metric functions."""
         pool_state_fn = self.sensor.get_metric_fn("pool_state")
@@ -172,6 +304,21 @@ class TestPoolMindClient:
         assert self.client.agent_id == "test-agent"
         assert self.client.hmac_secret == "test-secret"
     
+    def test_shared_session_is_not_closed(self):
+        """Test a client built on a shared session leaves closing it to the owner."""
+        shared_session = Mock()
+        shared_session.headers = {}
+        client = PoolMindClient(
+            base_url="http://localhost:3000",
+            agent_id="test-agent",
+            hmac_secret="test-secret",
+            session=shared_session
+        )
+        assert client.session is shared_session
+        
+        client.close()
+        shared_session.close.assert_not_called()
+    
     def test_generate_hmac_signature(self):
         """Test HMAC signature generation."""
         signature = self.client._generate_hmac_signature(
@@ -183,37 +330,28 @@ class TestPoolMindClient:
         assert isinstance(signature, str)
         assert len(signature) == 64  # SHA256 hex digest length
     
-    def test_fund_request_data_structure(self):
-        """Test fund request data structure."""
-        fund_request = FundRequest(
-            amount_stx=1000.0,
-            purpose="arbitrage_opportunity",
-            expected_profit=50.0,
-            risk_assessment="low",
-            exchanges=["binance", "okx"],
-            estimated_duration="5_minutes"
-        )
+    def test_authenticated_request_wire_format(self):
+        """Test the exact body bytes sent and the signature header for a known payload."""
+        mock_response = Mock()
+        mock_response.status_code = 200
         
-        assert fund_request.amount_stx == 1000.0
-        assert fund_request.purpose == "arbitrage_opportunity"
-        assert fund_request.expected_profit == 50.0
-        assert "binance" in fund_request.exchanges
-    
-    def test_profit_report_data_structure(self):
-        """Test profit report data structure."""
-        profit_report = ProfitReport(
-            trade_id="test-trade-123",
-            initial_amount=1000.0,
-            final_amount=1050.0,
-            profit=50.0,
-            fees_paid=5.0,
-            net_profit=45.0,
-            execution_time="300 seconds"
-        )
+        with (
+            patch("src.client.poolmind.time.time", return_value=1700000000.0),
+            patch.object(self.client.session, "request", return_value=mock_response) as mock_request,
+        ):
+            self.client._make_authenticated_request(
+                "POST",
+                "/api/v1/test",
+                {"recipient_address": "SP000", "amount": 100.5, "memo": "arb"}
+            )
         
-        assert profit_report.trade_id == "test-trade-123"
-        assert profit_report.initial_amount == 1000.0
-        assert profit_report.net_profit == 45.0
+        kwargs = mock_request.call_args.kwargs
+        # orjson emits compact JSON: no spaces after ',' or ':'
+        assert kwargs["data"] == b'{"recipient_address":"SP000","amount":100.5,"memo":"arb"}'
+        assert kwargs["headers"] == {
+            "x-signature": "sha256=b93d9b0be039e323684de7e3a53e636e5c99a52e61346f88850ad93c0a85f5ef",
+            "x-timestamp": "1700000000000"
+        }
 
 
 class TestPoolMindArbitrageAgent:
@@ -281,6 +419,18 @@ class TestPoolMindArbitrageAgent:
         
         # Mock prompt generator should have been called
         self.mock_prompt_generator.get_system_prompt.assert_called_once()
+    
+    def test_prepare_system_reuses_pool_state(self):
+        """Test system preparation doesn't refetch a pool state it was given."""
+        pool_state = self.mock_sensor.get_pool_state.return_value
+        self.mock_sensor.get_pool_state.reset_mock()
+        
+        self.agent.prepare_system(pool_state=pool_state)
+        
+        self.mock_sensor.get_pool_state.assert_not_called()
+        prompt_kwargs = self.mock_prompt_generator.get_system_prompt.call_args.kwargs
+        assert prompt_kwargs["available_stx"] == pool_state["available_stx"]
+        assert "pool_state" not in prompt_kwargs
 
 
 class TestPoolMindDataTypes:
@@ -336,5 +486,94 @@ class TestPoolMindDataTypes:
         assert opportunity.profit_percentage == 0.8
 
 
+class TestPoolMindMonitoringFlow:
+    """Test cases for poolmind_monitoring_flow."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.stop_event = threading.Event()
+        self.pool_states = []
+        self.checks = 0
+        
+        self.agent = Mock()
+        self.agent.min_profit_threshold = 0.5
+        self.agent.supported_exchanges = ["binance", "okx"]
+        self.agent.max_trade_size_percent = 10.0
+        self.agent.sensor.identify_arbitrage_opportunities.side_effect = self._identify
+        self.agent.sensor.get_pool_state.side_effect = lambda: self.pool_states[self.checks - 1]
+    
+    def _identify(self):
+        """Return the same opportunity on every check, stopping after the third."""
+        self.checks += 1
+        if self.checks == 3:
+            self.stop_event.set()
+        return [ArbitrageOpportunity(
+            buy_exchange="binance",
+            sell_exchange="okx",
+            buy_price=2.45,
+            sell_price=2.47,
+            profit_percentage=0.8,
+            required_amount=1000.0,
+            expected_profit=8.0,
+            risk_score=3,
+            execution_time_estimate=300,
+            timestamp=1700000000
+        )]
+    
+    @staticmethod
+    def _pool_state(available_stx):
+        return {
+            "current_nav": 1.05,
+            "available_stx": available_stx,
+            "total_shares": 95238,
+            "pool_size": 100000,
+        }
+    
+    def _run(self, cycle_results):
+        with patch("src.flows.poolmind_arbitrage.poolmind_arbitrage_flow", side_effect=cycle_results) as flow:
+            poolmind_monitoring_flow(
+                agent=self.agent,
+                session_id="test-session",
+                poolmind_client=Mock(),
+                monitoring_interval=0,
+                stop_event=self.stop_event,
+            )
+        return flow
+    
+    def test_unchanged_opportunity_is_skipped_after_completed_cycle(self):
+        """Test that a completed cycle is not repeated while nothing has changed."""
+        self.pool_states = [self._pool_state(50000)] * 3
+        
+        flow = self._run([True])
+        
+        assert self.checks == 3
+        assert flow.call_count == 1
+    
+    def test_cycle_reuses_the_checked_pool_state(self):
+        """Test that the cycle is given the pool state fetched for the check."""
+        self.pool_states = [self._pool_state(50000)] * 3
+        
+        flow = self._run([True])
+        
+        assert self.agent.sensor.get_pool_state.call_count == 3
+        assert flow.call_args.kwargs["pool_state"] is self.pool_states[0]
+    
+    def test_unchanged_opportunity_is_retried_after_failed_cycle(self):
+        """Test that a cycle that ended early is retried on the next check."""
+        self.pool_states = [self._pool_state(50000)] * 3
+        
+        flow = self._run([False, False, True])
+        
+        assert flow.call_count == 3
+    
+    def test_pool_state_change_reruns_cycle(self):
+        """Test that a pool state change reruns the cycle for the same quotes."""
+        self.pool_states = [self._pool_state(50000), self._pool_state(50000), self._pool_state(49000)]
+        
+        flow = self._run([True, True])
+        
+        assert flow.call_count == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
@@ -0,0 +1,170 @@
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to the path to import from src
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.db.sqlite import SQLiteDB, WriteBuffer
+from src.types import ChatHistory, Message
+
+
+INSERT_A = "INSERT INTO a (value) VALUES (?)"
+INSERT_B = "INSERT INTO b (value) VALUES (?)"
+
+
+class TestWriteBuffer:
+    """Test cases for WriteBuffer."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.executescript("CREATE TABLE a (value INTEGER); CREATE TABLE b (value INTEGER);")
+    
+    def teardown_method(self):
+        """Close the test connection."""
+        self.conn.close()
+    
+    def _count(self, table):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    
+    def test_rows_stay_pending_below_thresholds(self):
+        """Test that rows are not written until a threshold is reached."""
+        buffer = WriteBuffer(self.conn, max_rows=10, max_delay=60.0)
+        
+        buffer.add_many(INSERT_A, [(1,), (2,)])
+        
+        assert self._count("a") == 0
+    
+    def test_flushes_when_max_rows_reached(self):
+        """Test that reaching max_rows writes every pending row."""
+        buffer = WriteBuffer(self.conn, max_rows=3, max_delay=60.0)
+        
+        buffer.add_many(INSERT_A, [(1,), (2,)])
+        buffer.add(INSERT_A, (3,))
+        
+        assert self._count("a") == 3
+    
+    def test_flushes_when_oldest_row_is_stale(self):
+        """Test that a row added after max_delay flushes the whole buffer."""
+        buffer = WriteBuffer(self.conn, max_rows=10, max_delay=1.0)
+        
+        with patch("src.db.sqlite.time.monotonic", return_value=100.0) as monotonic:
+            buffer.add(INSERT_A, (1,))
+            assert self._count("a") == 0
+            
+            monotonic.return_value = 101.5
+            buffer.add(INSERT_A, (2,))
+        
+        assert self._count("a") == 2
+    
+    def test_flush_groups_rows_by_statement(self):
+        """Test that flush issues one executemany per statement in one transaction."""
+        conn = MagicMock()
+        conn.__enter__.return_value = conn
+        buffer = WriteBuffer(conn, max_rows=10, max_delay=60.0)
+        
+        buffer.add(INSERT_A, (1,))
+        buffer.add(INSERT_B, (2,))
+        buffer.add(INSERT_A, (3,))
+        buffer.flush()
+        
+        conn.__enter__.assert_called_once()
+        assert conn.executemany.call_count == 2
+        conn.executemany.assert_any_call(INSERT_A, [(1,), (3,)])
+        conn.executemany.assert_any_call(INSERT_B, [(2,)])
+    
+    def test_flush_with_nothing_pending_is_noop(self):
+        """Test that flushing an empty buffer does not open a transaction."""
+        conn = MagicMock()
+        buffer = WriteBuffer(conn)
+        
+        buffer.flush()
+        
+        conn.__enter__.assert_not_called()
+
+
+class TestSQLiteDBChatHistory:
+    """Test cases for buffered chat history writes in SQLiteDB."""
+    
+    def _count_chat_history(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM sup_chat_history").fetchone()[0]
+    
+    def test_close_flushes_buffered_chat_history(self, tmp_path):
+        """Test that buffered chat history reaches disk when the database is closed."""
+        db_path = str(tmp_path / "agent.db")
+        db = SQLiteDB(db_path, buffer_writes=True)
+        chat_history = ChatHistory([
+            Message(role="system", content="You are an arbitrage trader."),
+            Message(role="assistant", content="No trade."),
+        ])
+        
+        assert db.insert_chat_history("session-1", chat_history)
+        assert self._count_chat_history(db_path) == 0
+        
+        db.close()
+        
+        assert self._count_chat_history(db_path) == 2
+    
+    def test_chat_history_is_written_through_by_default(self, tmp_path):
+        """Test that chat history is on disk immediately unless buffering is requested."""
+        db_path = str(tmp_path / "agent.db")
+        with patch("src.db.sqlite.atexit.register") as register:
+            db = SQLiteDB(db_path)
+        
+        db.insert_chat_history("session-1", ChatHistory([Message(role="user", content="hi")]))
+        
+        assert self._count_chat_history(db_path) == 1
+        register.assert_not_called()
+        db.close()
+    
+    def test_flush_writes_buffered_chat_history(self, tmp_path):
+        """Test that an explicit flush writes chat history without closing."""
+        db_path = str(tmp_path / "agent.db")
+        db = SQLiteDB(db_path, buffer_writes=True)
+        db.insert_chat_history("session-1", ChatHistory([Message(role="user", content="hi")]))
+        
+        db.flush()
+        
+        assert self._count_chat_history(db_path) == 1
+        db.close()
+
+
+class TestSQLiteDBConnection:
+    """Test cases for the SQLiteDB connection settings."""
+    
+    def _journal_mode(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute("PRAGMA journal_mode").fetchone()[0]
+    
+    def test_default_keeps_rollback_journal(self, tmp_path):
+        """Test that a plain SQLiteDB leaves the file's journal mode alone."""
+        db_path = str(tmp_path / "shared.db")
+        SQLiteDB(db_path).close()
+        
+        assert self._journal_mode(db_path) == "delete"
+    
+    def test_wal_opt_in(self, tmp_path):
+        """Test that WAL journaling is only enabled when requested."""
+        db_path = str(tmp_path / "poolmind.db")
+        SQLiteDB(db_path, wal=True).close()
+        
+        assert self._journal_mode(db_path) == "wal"
+    
+    def test_concurrent_writes_share_the_connection(self, tmp_path):
+        """Test that writes from several threads on one SQLiteDB all land."""
+        db = SQLiteDB(str(tmp_path / "agent.db"))
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda i: db.create_agent_session(f"session-{i}", "concurrent-agent", "2024-01-01 00:00:00", "running"),
+                range(20)
+            ))
+        
+        assert all(results)
+        with db._transaction() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM sup_agent_sessions WHERE agent_id = ?", ("concurrent-agent",)).fetchone()[0] == 20
+        db.close()